@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Coroutine
+from typing import Any
 
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.typing import ConfigType
+from supernote.client.extended import ExtendedClient
 
 from .api import async_get_supernote_client
-from .const import DOMAIN
+from .cache import TTLCache
+from .const import (
+    DOMAIN,
+    FOLDER_LISTING_CACHE_TTL,
+    MAX_CONCURRENT_LLM_REQUESTS,
+    NOTE_PAGES_CACHE_TTL,
+)
 from .coordinator import SupernoteStorageCoordinator
 from .llm import async_register_llm_apis
 from .media_source import async_register_http_views
@@ -37,7 +47,25 @@ async def async_setup_entry(
     coordinator = SupernoteStorageCoordinator(hass, entry, sn)
     await coordinator.async_config_entry_first_refresh()
 
-    entry.runtime_data = SupernoteCloudData(client=sn, coordinator=coordinator)
+    @callback
+    def _async_create_fetch_task[T](
+        target: Coroutine[Any, Any, T],
+    ) -> asyncio.Task[T]:
+        """Run a cache fetch as a task that is cancelled when the entry unloads."""
+        return entry.async_create_background_task(hass, target, f"{DOMAIN} fetch")
+
+    entry.runtime_data = SupernoteCloudData(
+        client=sn,
+        extended=ExtendedClient(sn.client),
+        llm_semaphore=asyncio.Semaphore(MAX_CONCURRENT_LLM_REQUESTS),
+        folder_cache=TTLCache(
+            FOLDER_LISTING_CACHE_TTL, create_task=_async_create_fetch_task
+        ),
+        note_pages_cache=TTLCache(
+            NOTE_PAGES_CACHE_TTL, create_task=_async_create_fetch_task
+        ),
+        coordinator=coordinator,
+    )
 
     await hass.config_entries.async_forward_entry_setups(
         entry,
@@ -1,7 +1,9 @@
 """Supernote Cloud Auth."""
 
-import datetime
+import asyncio
 import logging
+import time
+from functools import cached_property
 from typing import cast
 
 import aiohttp
@@ -14,11 +16,20 @@ from supernote.client.client import Client
 from supernote.client.exceptions import SupernoteException, UnauthorizedException
 from supernote.client.login_client import LoginClient
 
-from .const import CONF_HOST, CONF_TOKEN_TIMESTAMP, DEFAULT_HOST, TOKEN_LIFETIME
+from .const import (
+    CONF_HOST,
+    CONF_TOKEN_TIMESTAMP,
+    DEFAULT_HOST,
+    TOKEN_LIFETIME,
+    TOKEN_REFRESH_SKEW,
+)
 from .types import SupernoteCloudConfigEntry
 
 _LOGGER = logging.getLogger(__name__)
 
+# Seconds after issue at which a token is refreshed
+_REFRESH_AFTER_SECONDS = (TOKEN_LIFETIME - TOKEN_REFRESH_SKEW).total_seconds()
+
 
 class ConfigEntryAuth(AbstractAuth):
     """Config entry auth."""
@@ -35,23 +46,34 @@ class ConfigEntryAuth(AbstractAuth):
         self._hass = hass
         self._entry = entry
         self._session = session
-        host = entry.options.get(CONF_HOST, DEFAULT_HOST)
-        self._login_client = LoginClient(Client(session, host=host))
+        self._token: str | None = None
+        self._expires_at: float | None = None
+        self._refresh_lock = asyncio.Lock()
 
     async def async_get_access_token(self) -> str:
         """Return a valid access token."""
         if self.is_expired():
-            await self._refresh_access_token()
-        return cast(str, self._entry.options[CONF_ACCESS_TOKEN])
+            async with self._refresh_lock:
+                # Another caller may have refreshed while we waited on the lock
+                if self.is_expired():
+                    await self._refresh_access_token()
+        if self._token is None:
+            self._token = cast(str, self._entry.options[CONF_ACCESS_TOKEN])
+        return self._token
+
+    @cached_property
+    def _login_client(self) -> LoginClient:
+        """Return the login client, only built when a refresh is needed."""
+        host = self._entry.options.get(CONF_HOST, DEFAULT_HOST)
+        return LoginClient(Client(self._session, host=host))
 
     def is_expired(self) -> bool:
-        token_timestamp = self._entry.options.get(CONF_TOKEN_TIMESTAMP, 0)
-        token_ts = datetime.datetime.fromtimestamp(
-            int(token_timestamp), tz=datetime.UTC
-        )
-        now = dt_util.now()
-        age = now - token_ts
-        return age > TOKEN_LIFETIME
+        """Return True if the token is expired or is about to expire."""
+        if self._expires_at is None:
+            self._expires_at = _refresh_deadline(
+                self._entry.options.get(CONF_TOKEN_TIMESTAMP, 0)
+            )
+        return time.time() > self._expires_at
 
     async def _refresh_access_token(self) -> None:
         """Refresh access token."""
@@ -74,11 +96,21 @@ class ConfigEntryAuth(AbstractAuth):
                 ) from err
             raise HomeAssistantError(f"API Error: {err}") from err
 
+        # Serve the new token from memory right away. The config entry store
+        # debounces the write to disk so it does not delay this request.
+        token_timestamp = dt_util.now().timestamp()
+        self._token = new_token
+        self._expires_at = _refresh_deadline(token_timestamp)
         self._hass.config_entries.async_update_entry(
             self._entry,
             options={
                 **self._entry.options,
                 CONF_ACCESS_TOKEN: new_token,
-                CONF_TOKEN_TIMESTAMP: dt_util.now().timestamp(),
+                CONF_TOKEN_TIMESTAMP: token_timestamp,
             },
         )
+
+
+def _refresh_deadline(token_timestamp: float) -> float:
+    """Return the timestamp after which a token issued at the given time is refreshed."""
+    return int(token_timestamp) + _REFRESH_AFTER_SECONDS
@@ -0,0 +1,73 @@
+"""Short-lived caches for Supernote Cloud responses."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable, Coroutine, Hashable
+from functools import partial
+from typing import Any
+
+DEFAULT_MAX_SIZE = 128
+
+
+class TTLCache[K: Hashable, V]:
+    """Cache of values that expire a fixed number of seconds after being stored.
+
+    Concurrent lookups of a missing key share a single in-flight fetch. Fetches
+    run as tasks made by `create_task` so the owner can tie them to its lifecycle.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_size: int = DEFAULT_MAX_SIZE,
+        create_task: Callable[
+            [Coroutine[Any, Any, V]], asyncio.Future[V]
+        ] = asyncio.ensure_future,
+    ) -> None:
+        """Initialize the cache."""
+        self._ttl = ttl
+        self._max_size = max_size
+        self._create_task = create_task
+        self._values: dict[K, tuple[float, V]] = {}
+        self._pending: dict[K, asyncio.Future[V]] = {}
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value for the key if it has not expired."""
+        if (cached := self._values.get(key)) is None:
+            return None
+        expires_at, value = cached
+        if time.monotonic() >= expires_at:
+            del self._values[key]
+            return None
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store a value, evicting the oldest entry when full."""
+        self._values.pop(key, None)
+        if len(self._values) >= self._max_size:
+            del self._values[next(iter(self._values))]
+        self._values[key] = (time.monotonic() + self._ttl, value)
+
+    async def async_get_or_fetch(
+        self, key: K, fetch: Callable[[], Coroutine[Any, Any, V]]
+    ) -> V:
+        """Return the cached value for the key, fetching it on a miss.
+
+        Errors raised by the fetch are propagated to every waiting caller and
+        are not cached.
+        """
+        if (value := self.get(key)) is not None:
+            return value
+        if (future := self._pending.get(key)) is None:
+            future = self._create_task(fetch())
+            self._pending[key] = future
+            future.add_done_callback(partial(self._fetch_done, key))
+        return await asyncio.shield(future)
+
+    def _fetch_done(self, key: K, future: asyncio.Future[V]) -> None:
+        """Store the result of a completed fetch."""
+        self._pending.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self.set(key, future.result())
@@ -53,6 +53,18 @@ OPTIONS_FLOW = {
     "init": SchemaFlowFormStep(),
 }
 
+TEXT_SELECTOR = selector.TextSelector(selector.TextSelectorConfig())
+PASSWORD_SELECTOR = selector.TextSelector(
+    selector.TextSelectorConfig(type=selector.TextSelectorType.PASSWORD)
+)
+
+SMS_SCHEMA = vol.Schema(
+    {
+        vol.Required("code"): TEXT_SELECTOR,
+    }
+)
+REAUTH_CONFIRM_SCHEMA = vol.Schema({})
+
 
 class SupernoteCloudConfigFlowHandler(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Supernote Cloud."""
@@ -66,6 +78,8 @@ class SupernoteCloudConfigFlowHandler(ConfigFlow, domain=DOMAIN):
         self._password: str | None = None
         self._host: str | None = None
         self._sms_timestamp: str | None = None
+        self._login_client: LoginClient | None = None
+        self._login_client_host: str | None = None
 
     @staticmethod
     @callback
@@ -113,20 +127,12 @@ class SupernoteCloudConfigFlowHandler(ConfigFlow, domain=DOMAIN):
                     vol.Required(
                         CONF_HOST,
                         default=self._host or DEFAULT_HOST,
-                    ): selector.TextSelector(
-                        selector.TextSelectorConfig(),
-                    ),
+                    ): TEXT_SELECTOR,
                     vol.Required(
                         CONF_USERNAME,
                         default=self._username or "",
-                    ): selector.TextSelector(
-                        selector.TextSelectorConfig(),
-                    ),
-                    vol.Required(CONF_PASSWORD): selector.TextSelector(
-                        selector.TextSelectorConfig(
-                            type=selector.TextSelectorType.PASSWORD
-                        ),
-                    ),
+                    ): TEXT_SELECTOR,
+                    vol.Required(CONF_PASSWORD): PASSWORD_SELECTOR,
                 }
             ),
             errors=errors or None,
@@ -156,32 +162,29 @@ class SupernoteCloudConfigFlowHandler(ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="sms",
-            data_schema=vol.Schema(
-                {
-                    vol.Required("code"): selector.TextSelector(
-                        selector.TextSelectorConfig(),
-                    ),
-                }
-            ),
+            data_schema=SMS_SCHEMA,
             errors=errors or None,
         )
 
     @callback
     def _async_get_login_client(self) -> LoginClient:
-        """Get a login client."""
-        return LoginClient(Client(async_get_clientsession(self.hass), host=self._host))
+        """Get a login client, reused across steps of the flow."""
+        if self._login_client is None or self._login_client_host != self._host:
+            self._login_client = LoginClient(
+                Client(async_get_clientsession(self.hass), host=self._host)
+            )
+            self._login_client_host = self._host
+        return self._login_client
 
     async def _async_create_supernote_entry(
         self, access_token: str
     ) -> ConfigFlowResult:
-        """Create the config entry."""
-        # Verify the API works and get user info
-        websession = async_get_clientsession(self.hass)
-        sn = Supernote.from_token(access_token, host=self._host, session=websession)
-
-        # Let's try to get something to confirm it works.
-        await sn.device.get_capacity()
+        """Create the config entry.
 
+        The access token was just issued by a successful login so it is not
+        verified with another request here. The first coordinator refresh
+        exercises the API when the entry is set up.
+        """
         assert self._username is not None
         unique_id = self._username
         await self.async_set_unique_id(unique_id)
@@ -236,6 +239,6 @@ class SupernoteCloudConfigFlowHandler(ConfigFlow, domain=DOMAIN):
         if user_input is None:
             return self.async_show_form(
                 step_id="reauth_confirm",
-                data_schema=vol.Schema({}),
+                data_schema=REAUTH_CONFIRM_SCHEMA,
             )
         return await self.async_step_user()
@@ -10,3 +10,19 @@ CONF_HOST = "host"
 
 DEFAULT_HOST = "https://cloud.supernote.com"
 TOKEN_LIFETIME = datetime.timedelta(days=5)
+# Refresh the token this long before it expires so requests never use a stale token
+TOKEN_REFRESH_SKEW = datetime.timedelta(seconds=60)
+
+# Maximum number of LLM tool requests sent to Supernote Cloud at once per account
+MAX_CONCURRENT_LLM_REQUESTS = 4
+
+# Seconds that folder listings are reused while browsing and serving note pages
+FOLDER_LISTING_CACHE_TTL = 60
+# Seconds that note page conversions are reused, keyed by the note contents
+NOTE_PAGES_CACHE_TTL = 60
+
+# Seconds that LLM tool results are reused for repeated identical calls
+SEARCH_CACHE_TTL = 300
+# Transcripts are looked up by file id alone, without the md5 that would reveal
+# an edit, so they are kept no longer than a note page conversion
+TRANSCRIPT_CACHE_TTL = 60
@@ -16,11 +16,12 @@ from homeassistant.helpers.llm import (
     ToolInput,
     async_register_api,
 )
+from homeassistant.util import dt as dt_util
 from homeassistant.util.json import JsonObjectType
-from supernote.client.exceptions import UnauthorizedException
-from supernote.client.extended import ExtendedClient
+from supernote.client.exceptions import SupernoteException, UnauthorizedException
 
-from .const import DOMAIN
+from .cache import TTLCache
+from .const import DOMAIN, SEARCH_CACHE_TTL, TRANSCRIPT_CACHE_TTL
 from .types import SupernoteCloudConfigEntry
 
 _LOGGER = logging.getLogger(__name__)
@@ -31,17 +32,34 @@ async def async_register_llm_apis(
 ) -> None:
     """Register LLM APIs for Supernote Cloud."""
     try:
-        async_register_api(
-            hass,
-            SupernoteLLMApi(
+        entry.async_on_unload(
+            async_register_api(
                 hass,
-                entry,
-            ),
+                SupernoteLLMApi(
+                    hass,
+                    entry,
+                ),
+            )
         )
     except HomeAssistantError as err:
         _LOGGER.debug("Error registering Supernote LLM APIs: %s", err)
 
 
+def _includes_today(date_after: str | None, date_before: str | None) -> bool:
+    """Return True if a search date filter may match notes written today.
+
+    A missing bound leaves the range open on that side, so an unfiltered
+    search always includes today.
+    """
+    after = dt_util.parse_date(date_after) if date_after else None
+    before = dt_util.parse_date(date_before) if date_before else None
+    if (date_after and after is None) or (date_before and before is None):
+        # The filter could not be interpreted, so assume it may include today
+        return True
+    today = dt_util.now().date()
+    return (after is None or after <= today) and (before is None or before >= today)
+
+
 class SearchTool(Tool):
     """Supernote search tool."""
 
@@ -70,32 +88,40 @@ class SearchTool(Tool):
     def __init__(self, entry: SupernoteCloudConfigEntry) -> None:
         """Initialize the tool."""
         self._entry = entry
+        self._cache: TTLCache[tuple, JsonObjectType] = TTLCache(SEARCH_CACHE_TTL)
 
     async def async_call(
         self, hass: HomeAssistant, tool_input: ToolInput, llm_context: LLMContext
     ) -> JsonObjectType:
         """Call the tool."""
         args = tool_input.tool_args
+        query = args["query"]
+        top_n = args.get("top_n", 5)
+        name_filter = args.get("name_filter")
+        date_after = args.get("date_after")
+        date_before = args.get("date_before")
+        cache_key = (query, top_n, name_filter, date_after, date_before)
+        if (cached := self._cache.get(cache_key)) is not None:
+            return cached
 
-        # Instantiate ExtendedClient on the fly
-        sn = self._entry.runtime_data.client
-        extended = ExtendedClient(sn.client)
+        data = self._entry.runtime_data
 
         try:
-            results = await extended.search(
-                query=args["query"],
-                top_n=args.get("top_n", 5),
-                name_filter=args.get("name_filter"),
-                date_after=args.get("date_after"),
-                date_before=args.get("date_before"),
-            )
+            async with data.llm_semaphore:
+                results = await data.extended.search(
+                    query=query,
+                    top_n=top_n,
+                    name_filter=name_filter,
+                    date_after=date_after,
+                    date_before=date_before,
+                )
         except UnauthorizedException as err:
             self._entry.async_start_reauth(hass)
             return {"error": f"Supernote authentication failed: {err}"}
-        except Exception as err:  # noqa: BLE001
+        except (SupernoteException, TimeoutError) as err:
             return {"error": f"Error searching Supernote: {err}"}
 
-        return cast(
+        response = cast(
             JsonObjectType,
             {
                 "results": [
@@ -110,6 +136,11 @@ class SearchTool(Tool):
                 ]
             },
         )
+        # Notes written today may still change, so only cache ranges that ended
+        # before today
+        if not _includes_today(date_after, date_before):
+            self._cache.set(cache_key, response)
+        return response
 
 
 class TranscriptTool(Tool):
@@ -136,35 +167,43 @@ class TranscriptTool(Tool):
     def __init__(self, entry: SupernoteCloudConfigEntry) -> None:
         """Initialize the tool."""
         self._entry = entry
+        self._cache: TTLCache[tuple, JsonObjectType] = TTLCache(TRANSCRIPT_CACHE_TTL)
 
     async def async_call(
         self, hass: HomeAssistant, tool_input: ToolInput, llm_context: LLMContext
     ) -> JsonObjectType:
         """Call the tool."""
         args = tool_input.tool_args
+        file_id = args["file_id"]
+        start_index = args.get("start_index")
+        end_index = args.get("end_index")
+        cache_key = (file_id, start_index, end_index)
+        if (cached := self._cache.get(cache_key)) is not None:
+            return cached
 
-        # Instantiate ExtendedClient on the fly
-        sn = self._entry.runtime_data.client
-        extended = ExtendedClient(sn.client)
+        data = self._entry.runtime_data
 
         try:
-            result = await extended.get_transcript(
-                file_id=args["file_id"],
-                start_index=args.get("start_index"),
-                end_index=args.get("end_index"),
-            )
+            async with data.llm_semaphore:
+                result = await data.extended.get_transcript(
+                    file_id=file_id,
+                    start_index=start_index,
+                    end_index=end_index,
+                )
         except UnauthorizedException as err:
             self._entry.async_start_reauth(hass)
             return {"error": f"Supernote authentication failed: {err}"}
-        except Exception as err:  # noqa: BLE001
+        except (SupernoteException, TimeoutError) as err:
             return {"error": f"Error fetching Supernote transcript: {err}"}
 
-        return cast(
+        response = cast(
             JsonObjectType,
             {
                 "transcript": result.transcript,
             },
         )
+        self._cache.set(cache_key, response)
+        return response
 
 
 class SupernoteLLMApi(API):
@@ -180,6 +219,10 @@ class SupernoteLLMApi(API):
         self.id = f"{DOMAIN}-{entry.entry_id}"
         self.name = slugify.slugify(f"Supernote: {entry.title}")[:16]
         self._entry = entry
+        self._tools: list[Tool] = [
+            SearchTool(entry),
+            TranscriptTool(entry),
+        ]
 
     async def async_get_api_instance(self, llm_context: LLMContext) -> APIInstance:
         """Return the instance of the API."""
@@ -187,8 +230,5 @@ class SupernoteLLMApi(API):
             api=self,
             api_prompt="You have access to the user's Supernote notebooks via search and transcript tools.",
             llm_context=llm_context,
-            tools=[
-                SearchTool(self._entry),
-                TranscriptTool(self._entry),
-            ],
+            tools=self._tools,
         )
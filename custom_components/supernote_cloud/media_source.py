@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import StrEnum
+from functools import partial
 from typing import Self, cast
 
+from aiohttp import ClientError, hdrs
 from aiohttp.web import Request, Response, StreamResponse
 from homeassistant.components.http.view import HomeAssistantView
 from homeassistant.components.media_player import MediaClass, MediaType
@@ -21,12 +24,18 @@ from homeassistant.core import HomeAssistant, callback
 from supernote.client.api import Supernote
 from supernote.client.exceptions import ApiException, UnauthorizedException
 from supernote.models.base import BooleanEnum
+from supernote.models.file_device import PngVO
+from supernote.models.file_web import FileListQueryVO, UserFileVO
 
 from .const import DOMAIN
 from .types import SupernoteCloudConfigEntry
 
 _LOGGER = logging.getLogger(__name__)
 
+# Clients revalidate every time so the md5 ETag reveals an edited note
+PAGE_CACHE_CONTROL = "private, no-cache"
+PAGE_CHUNK_SIZE = 64 * 1024
+
 
 class SupernoteIdentifierType(StrEnum):
     """Type for a SupernoteIdentifier."""
@@ -38,13 +47,17 @@ class SupernoteIdentifierType(StrEnum):
     @classmethod
     def of(cls, name: str) -> SupernoteIdentifierType:
         """Parse a SupernoteIdentifierType by string value."""
-        for enum in SupernoteIdentifierType:
-            if enum.value == name:
-                return enum
-        raise ValueError(f"Invalid SupernoteIdentifierType: {name}")
+        if (id_type := _ID_TYPES.get(name)) is None:
+            raise ValueError(f"Invalid SupernoteIdentifierType: {name}")
+        return id_type
+
 
+_ID_TYPES: dict[str, SupernoteIdentifierType] = {
+    id_type.value: id_type for id_type in SupernoteIdentifierType
+}
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class SupernoteIdentifier:
     """Item identifier in a media source URL."""
 
@@ -54,69 +67,73 @@ class SupernoteIdentifier:
     id_type: SupernoteIdentifierType
     """Type of identifier"""
 
-    media_id_path: list[int]
+    media_id_path: tuple[int, ...]
     """Identifies the folder or file contents to show."""
 
+    _media_id: int = field(init=False, repr=False, compare=False)
+    _parent_folder_id: int | None = field(init=False, repr=False, compare=False)
+    _note_file_id: int | None = field(init=False, repr=False, compare=False)
+    _page_id: int | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Validate the path and compute the ids derived from it once."""
+        path = self.media_id_path
+        if not path:
+            raise ValueError(f"Invalid identifier did not contain a media id: {self}")
+        parent_folder_id = path[-2] if len(path) >= 2 else None
+        note_file_id: int | None = None
+        page_id: int | None = None
+        if self.id_type == SupernoteIdentifierType.NOTE_FILE:
+            note_file_id = path[-1]
+        elif self.id_type == SupernoteIdentifierType.NOTE_PAGE:
+            if len(path) < 3:
+                raise ValueError(
+                    f"Invalid note page identifier did not contain a parent folder, note file and page id: {self}"
+                )
+            parent_folder_id, note_file_id, page_id = path[-3:]
+        object.__setattr__(self, "_media_id", path[-1])
+        object.__setattr__(self, "_parent_folder_id", parent_folder_id)
+        object.__setattr__(self, "_note_file_id", note_file_id)
+        object.__setattr__(self, "_page_id", page_id)
+
     @property
     def is_root(self) -> bool:
         """Return True if this is the root node."""
-        return len(self.media_id_path) == 1
+        return self._parent_folder_id is None
 
     @property
     def media_id(self) -> int:
         """Return the leaf media id for the identifier."""
-        return self.media_id_path[-1]
+        return self._media_id
 
     @property
     def parent_folder_id(self) -> int | None:
         """Return the parent node media id for the identifier."""
-        if self.id_type == SupernoteIdentifierType.NOTE_PAGE:
-            if len(self.media_id_path) < 3:
-                raise ValueError(
-                    f"Invalid note page identifier did not contain a parent folder id: {self}"
-                )
-            return self.media_id_path[-3]
-        if len(self.media_id_path) < 2:
-            return None
-        return self.media_id_path[-2]
+        return self._parent_folder_id
 
     @property
     def note_file_id(self) -> int | None:
-        """Return the note file id for a NOTE_PAGE identifier."""
-        if self.id_type == SupernoteIdentifierType.NOTE_FILE:
-            return self.media_id
-        if self.id_type != SupernoteIdentifierType.NOTE_PAGE:
-            return None
-        if len(self.media_id_path) < 2:
-            raise ValueError(
-                f"Invalid note page identifier did not contain a note file id: {self}"
-            )
-        return self.media_id_path[-2]
+        """Return the note file id for a NOTE_FILE or NOTE_PAGE identifier."""
+        return self._note_file_id
 
     @property
     def page_id(self) -> int | None:
         """Return the page id for a NOTE_PAGE identifier."""
-        if self.id_type != SupernoteIdentifierType.NOTE_PAGE:
-            return None
-        if len(self.media_id_path) < 3:
-            raise ValueError(
-                f"Invalid note page identifier did not contain a page id: {self}"
-            )
-        return self.media_id_path[-1]
+        return self._page_id
 
     def as_string(self, separator: str = "/") -> str:
         """Serialize the identifier as a string."""
-        path_parts = separator.join(str(part) for part in self.media_id_path)
+        path_parts = separator.join(map(str, self.media_id_path))
         return f"{self.config_entry_id}{separator}{self.id_type}{separator}{path_parts}"
 
     @classmethod
     def of(cls, identifier: str, separator: str = "/") -> Self:
         """Parse a SupernoteIdentifier form a string."""
-        parts = identifier.split(separator, maxsplit=2)
-        if len(parts) != 3:
+        parts = identifier.split(separator)
+        if len(parts) < 3:
             raise ValueError(f"Invalid identifier: {identifier}")
         try:
-            path_parts = [int(p) for p in parts[2].split(separator)]
+            path_parts = tuple(map(int, parts[2:]))
         except ValueError as err:
             raise ValueError(f"Invalid identifier: {identifier}") from err
         return cls(parts[0], SupernoteIdentifierType.of(parts[1]), path_parts)
@@ -131,17 +148,17 @@ class SupernoteIdentifier:
         return cls.of(identifier, ":")
 
     @classmethod
-    def folder(cls, config_entry_id: str, media_ids: list[int]) -> Self:
+    def folder(cls, config_entry_id: str, media_ids: tuple[int, ...]) -> Self:
         """Create an album SupernoteIdentifier."""
         return cls(config_entry_id, SupernoteIdentifierType.FOLDER, media_ids)
 
     @classmethod
-    def note_file(cls, config_entry_id: str, media_ids: list[int]) -> Self:
+    def note_file(cls, config_entry_id: str, media_ids: tuple[int, ...]) -> Self:
         """Create an album SupernoteIdentifier."""
         return cls(config_entry_id, SupernoteIdentifierType.NOTE_FILE, media_ids)
 
     @classmethod
-    def note_page(cls, config_entry_id: str, media_ids: list[int]) -> Self:
+    def note_page(cls, config_entry_id: str, media_ids: tuple[int, ...]) -> Self:
         """Create an album SupernoteIdentifier."""
         return cls(config_entry_id, SupernoteIdentifierType.NOTE_PAGE, media_ids)
 
@@ -187,10 +204,13 @@ class ItemContentView(HomeAssistantView):
             return Response(status=400, text=msg)
         sn: Supernote = entry.runtime_data.client
 
+        if (parent_folder_id := identifier.parent_folder_id) is None:
+            msg = f"Could not find parent folder for {identifier}"
+            _LOGGER.error(msg)
+            return Response(status=400, text=msg)
+
         try:
-            folder_contents = await sn.device.list_folder(
-                folder_id=identifier.parent_folder_id
-            )
+            folder_contents = await _async_list_folder(entry, parent_folder_id)
         except UnauthorizedException as err:
             _LOGGER.error("Authentication failed during folder list: %s", err)
             entry.async_start_reauth(self.hass)
@@ -199,31 +219,16 @@ class ItemContentView(HomeAssistantView):
             _LOGGER.error("Failed to fetch folder contents: %s", err)
             return Response(status=500, text=str(err))
 
-        if folder_contents is None:
-            msg = f"Could not find folder contents for {identifier}"
-            _LOGGER.error(msg)
-            return Response(status=400, text=msg)
-
-        # Find file_info in entries
-        file_info = next(
-            (
-                item
-                for item in folder_contents.entries
-                if str(item.id) == str(identifier.note_file_id)
-            ),
-            None,
-        )
+        file_info = _find_file(folder_contents, identifier.note_file_id)
         if file_info is None:
-            msg = f"Could not find file {identifier.note_file_id} in parent {identifier.parent_folder_id}"
+            msg = f"Could not find file {identifier.note_file_id} in parent {parent_folder_id}"
             _LOGGER.error(msg)
             return Response(status=400, text=msg)
 
         try:
-            png_pages = await sn.device.note_to_png(int(file_info.id))
-            if (
-                png_pages.png_page_vo_list is None
-                or identifier.page_id is None
-                or identifier.page_id >= len(png_pages.png_page_vo_list)
+            png_pages = await _async_note_pages(entry, file_info)
+            if identifier.page_id is None or identifier.page_id >= len(
+                png_pages.png_page_vo_list
             ):
                 return Response(status=404, text="Page not found")
 
@@ -231,8 +236,20 @@ class ItemContentView(HomeAssistantView):
             if not page_vo.url:
                 return Response(status=404, text="Page URL not found")
 
-            content = await sn.client.get_content(page_vo.url)
-            return Response(body=content, content_type="image/png")
+            # A page image only changes when the note contents (and its md5)
+            # change. The conversion is cached by md5, so the page is checked
+            # against it before answering a conditional request.
+            headers: dict[str, str] = {}
+            if file_info.md5:
+                etag = f"{file_info.md5}-{identifier.page_id}"
+                headers = {
+                    hdrs.ETAG: f'"{etag}"',
+                    hdrs.CACHE_CONTROL: PAGE_CACHE_CONTROL,
+                }
+                if any(tag.value == etag for tag in request.if_none_match or ()):
+                    return Response(status=304, headers=headers)
+
+            page_resp = await sn.client.get(page_vo.url)
         except UnauthorizedException as err:
             _LOGGER.error("Authentication failed during note download: %s", err)
             entry.async_start_reauth(self.hass)
@@ -241,6 +258,33 @@ class ItemContentView(HomeAssistantView):
             _LOGGER.error("Failed to fetch note content: %s", err)
             return Response(status=500, text=str(err))
 
+        # Relay the image as it arrives rather than buffering the whole page
+        response = StreamResponse(headers=headers)
+        response.content_type = "image/png"
+        # The session decompresses encoded bodies, so the upstream length only
+        # matches the bytes written when the body was sent unencoded
+        if (
+            page_resp.content_length is not None
+            and hdrs.CONTENT_ENCODING not in page_resp.headers
+        ):
+            response.content_length = page_resp.content_length
+        # Once headers are sent a failure is re-raised so aiohttp drops the
+        # connection rather than finish a truncated page as a successful 200
+        try:
+            await response.prepare(request)
+            async for chunk in page_resp.content.iter_chunked(PAGE_CHUNK_SIZE):
+                await response.write(chunk)
+        except ConnectionResetError as err:
+            _LOGGER.debug("Client disconnected while streaming note content: %s", err)
+            raise
+        except (ClientError, TimeoutError) as err:
+            _LOGGER.error("Failed to stream note content: %s", err)
+            raise
+        finally:
+            page_resp.release()
+        await response.write_eof()
+        return response
+
 
 async def async_get_media_source(hass: HomeAssistant) -> MediaSource:
     """Set up Supernote Cloud media source."""
@@ -304,7 +348,7 @@ class SupernoteCloudMediaSource(MediaSource):
                 children=[
                     _build_account(
                         entry,
-                        SupernoteIdentifier.folder(cast(str, entry.unique_id), [0]),
+                        SupernoteIdentifier.folder(cast(str, entry.unique_id), (0,)),
                     )
                     for entry in self._async_config_entries()
                 ],
@@ -316,100 +360,95 @@ class SupernoteCloudMediaSource(MediaSource):
         except ValueError as err:
             raise BrowseError(f"Could not parse identifier: {item.identifier}") from err
         _LOGGER.debug("Browsing media for %s", identifier)
-        if identifier.id_type is None:
-            raise BrowseError(
-                f"Invalid identifier did not contain an id type: {identifier}"
-            )
 
         entry = self._async_config_entry(identifier.config_entry_id)
+        if identifier.id_type == SupernoteIdentifierType.FOLDER:
+            return await self._async_browse_folder(entry, identifier)
+        return await self._async_browse_note(entry, identifier)
+
+    async def _async_browse_folder(
+        self, entry: SupernoteCloudConfigEntry, identifier: SupernoteIdentifier
+    ) -> BrowseMediaSource:
+        """Return a folder with its child folders and notes."""
         entry_unique_id = cast(str, entry.unique_id)
         sn: Supernote = entry.runtime_data.client
-        if identifier.id_type == SupernoteIdentifierType.FOLDER:
+        try:
             if identifier.parent_folder_id is None:
                 # This is the root folder for the account
-                source = _build_folder(entry_unique_id, [0], entry.title)
+                name = entry.title
+                folder_contents_vo = await _async_list_folder(
+                    entry, identifier.media_id
+                )
             else:
-                try:
-                    # Identifier media_id is the folder we are looking at
-                    path_info = await sn.web.path_query(identifier.media_id)
-                    name = (
-                        path_info.path.split("/")[-1]
-                        if path_info.path
-                        else f"Folder {identifier.media_id}"
-                    )
-                except UnauthorizedException:
-                    raise
-                except ApiException:
-                    name = f"Folder {identifier.media_id}"
-
-                source = _build_folder(
-                    entry_unique_id,
-                    [identifier.parent_folder_id, identifier.media_id],
-                    name,
+                # Identifier media_id is the folder we are looking at. Its
+                # name and its children are independent, so fetch both at once.
+                name, folder_contents_vo = await asyncio.gather(
+                    _async_folder_name(sn, identifier.media_id),
+                    _async_list_folder(entry, identifier.media_id),
                 )
+        except UnauthorizedException:
+            raise
+        except ApiException as err:
+            raise BrowseError(f"Failed to fetch folder contents: {err}") from err
+
+        source = _build_folder(
+            SupernoteIdentifier.folder(
+                entry_unique_id,
+                identifier.media_id_path[-2:],
+            ).as_string(),
+            name,
+        )
 
-            # Add the children of the folder
+        # All children share an identifier prefix and differ only by their id
+        folder_prefix = SupernoteIdentifier.folder(
+            entry_unique_id, (identifier.media_id,)
+        ).as_string()
+        note_file_prefix = SupernoteIdentifier.note_file(
+            entry_unique_id, (identifier.media_id,)
+        ).as_string()
+        children = []
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        for child_item in folder_contents_vo.user_file_vo_list:
+            if debug:
+                _LOGGER.debug("Item: %s", child_item)
             try:
-                folder_contents_vo = await sn.web.list_query(
-                    directory_id=identifier.media_id, page_size=100
+                item_id = int(child_item.id)
+            except ValueError:
+                _LOGGER.warning("Skipping item with non-integer ID: %s", child_item.id)
+                continue
+
+            if child_item.is_folder == BooleanEnum.YES:
+                children.append(
+                    _build_folder(f"{folder_prefix}/{item_id}", child_item.file_name)
                 )
-            except UnauthorizedException:
-                raise
-            except ApiException as err:
-                raise BrowseError(f"Failed to fetch folder contents: {err}") from err
-
-            children = []
-            for child_item in folder_contents_vo.user_file_vo_list:
-                _LOGGER.debug("Item: %s", child_item)
-                try:
-                    item_id = int(child_item.id)
-                except ValueError:
-                    _LOGGER.warning(
-                        "Skipping item with non-integer ID: %s", child_item.id
-                    )
-                    continue
-
-                if child_item.is_folder == BooleanEnum.YES:
-                    children.append(
-                        _build_folder(
-                            entry_unique_id,
-                            [identifier.media_id, item_id],
-                            child_item.file_name,
-                        )
-                    )
-                elif child_item.file_name.lower().endswith(".note"):
-                    children.append(
-                        _build_file(
-                            entry_unique_id,
-                            identifier.media_id,
-                            item_id,
-                            child_item.file_name,
-                        )
-                    )
-                # Ignore other file types
+            elif child_item.file_name.lower().endswith(".note"):
+                children.append(
+                    _build_file(f"{note_file_prefix}/{item_id}", child_item.file_name)
+                )
+            # Ignore other file types
 
-            source.children = children
-            return source
+        source.children = children
+        return source
 
+    async def _async_browse_note(
+        self, entry: SupernoteCloudConfigEntry, identifier: SupernoteIdentifier
+    ) -> BrowseMediaSource:
+        """Return a note with its pages, or a single page of a note."""
+        entry_unique_id = cast(str, entry.unique_id)
         if identifier.parent_folder_id is None:
             raise ValueError("Cannot browse root folder as a note")
 
         # We are browsing a note file
         try:
-            parent_folder_contents_vo = await sn.web.list_query(
-                directory_id=identifier.parent_folder_id, page_size=100
+            parent_folder_contents_vo = await _async_list_folder(
+                entry, identifier.parent_folder_id
             )
         except UnauthorizedException:
             raise
         except ApiException as err:
             raise BrowseError(f"Failed to fetch parent folder contents: {err}") from err
 
-        # Find the file in the listing
-        file_info = None
-        for child_item in parent_folder_contents_vo.user_file_vo_list:
-            if str(child_item.id) == str(identifier.note_file_id):
-                file_info = child_item
-                break
+        file_info = _find_file(parent_folder_contents_vo, identifier.note_file_id)
 
         if file_info is None:
             raise BrowseError(
@@ -422,7 +461,7 @@ class SupernoteCloudMediaSource(MediaSource):
         # Convert note to PNG to get page count
         # We can use that for count.
         try:
-            conversion_res = await sn.device.note_to_png(int(file_info.id))
+            conversion_res = await _async_note_pages(entry, file_info)
             # We assume pages are just numbered for now or check if API gives names?
             # PngPageVO has url.
             page_count = len(conversion_res.png_page_vo_list)
@@ -451,26 +490,27 @@ class SupernoteCloudMediaSource(MediaSource):
             return _build_page(
                 SupernoteIdentifier.note_page(
                     identifier.config_entry_id,
-                    [
+                    (
                         p_folder_id,
                         p_note_id,
                         identifier.page_id,
-                    ],
+                    ),
                 ).as_string(),
                 page_name,
             )
 
         source = _build_file(
-            entry_unique_id,
-            identifier.parent_folder_id,
-            int(file_info.id),
+            SupernoteIdentifier.note_file(
+                entry_unique_id,
+                (identifier.parent_folder_id, int(file_info.id)),
+            ).as_string(),
             file_info.file_name,
         )
         source.children = [
             _build_page(
                 SupernoteIdentifier.note_page(
                     identifier.config_entry_id,
-                    [identifier.parent_folder_id, identifier.media_id, page_id],
+                    (identifier.parent_folder_id, identifier.media_id, page_id),
                 ).as_string(),
                 page_name,
             )
@@ -497,6 +537,56 @@ class SupernoteCloudMediaSource(MediaSource):
         return entry
 
 
+async def _async_folder_name(sn: Supernote, folder_id: int) -> str:
+    """Return the display name of a folder, falling back to its id."""
+    try:
+        path_info = await sn.web.path_query(folder_id)
+    except UnauthorizedException:
+        raise
+    except ApiException:
+        return f"Folder {folder_id}"
+    return path_info.path.split("/")[-1] if path_info.path else f"Folder {folder_id}"
+
+
+async def _async_list_folder(
+    entry: SupernoteCloudConfigEntry, folder_id: int
+) -> FileListQueryVO:
+    """Return the contents of a folder, reusing a recent listing if available."""
+    data = entry.runtime_data
+    return await data.folder_cache.async_get_or_fetch(
+        folder_id,
+        partial(data.client.web.list_query, directory_id=folder_id, page_size=100),
+    )
+
+
+def _find_file(
+    folder_contents: FileListQueryVO, file_id: int | None
+) -> UserFileVO | None:
+    """Return the entry for a file in a folder listing, if present."""
+    target_id = str(file_id)
+    return next(
+        (item for item in folder_contents.user_file_vo_list if item.id == target_id),
+        None,
+    )
+
+
+async def _async_note_pages(
+    entry: SupernoteCloudConfigEntry, file_info: UserFileVO
+) -> PngVO:
+    """Return the page images of a note, reusing a recent conversion if available.
+
+    Browsing a note converts it to find the page count, and the conversion is
+    then reused when the pages themselves are requested. The md5 is part of the
+    key so an edited note is converted again.
+    """
+    data = entry.runtime_data
+    file_id = int(file_info.id)
+    return await data.note_pages_cache.async_get_or_fetch(
+        (file_id, file_info.md5),
+        partial(data.client.device.note_to_png, file_id),
+    )
+
+
 def _build_account(
     config_entry: SupernoteCloudConfigEntry,
     identifier: SupernoteIdentifier,
@@ -513,16 +603,11 @@ def _build_account(
     )
 
 
-def _build_folder(
-    config_entry_id: str, media_ids: list[int], name: str
-) -> BrowseMediaSource:
+def _build_folder(identifier_str: str, name: str) -> BrowseMediaSource:
     """Build a media item node for a folder."""
     return BrowseMediaSource(
         domain=DOMAIN,
-        identifier=SupernoteIdentifier.folder(
-            config_entry_id,
-            media_ids,
-        ).as_string(),
+        identifier=identifier_str,
         media_class=MediaClass.APP,
         media_content_type=MediaType.APP,
         title=name,
@@ -531,16 +616,11 @@ def _build_folder(
     )
 
 
-def _build_file(
-    config_entry_id: str, parent_folder_id: int, file_id: int, name: str
-) -> BrowseMediaSource:
+def _build_file(identifier_str: str, name: str) -> BrowseMediaSource:
     """Build a media item node for a file."""
     return BrowseMediaSource(
         domain=DOMAIN,
-        identifier=SupernoteIdentifier.note_file(
-            config_entry_id,
-            [parent_folder_id, file_id],
-        ).as_string(),
+        identifier=identifier_str,
         media_class=MediaClass.ALBUM,
         media_content_type=MediaClass.ALBUM,
         title=name,
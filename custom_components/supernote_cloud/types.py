@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from homeassistant.config_entries import ConfigEntry
-from supernote.client.api import Supernote
 
 if TYPE_CHECKING:
+    from supernote.client.api import Supernote
+    from supernote.client.extended import ExtendedClient
+    from supernote.models.file_device import PngVO
+    from supernote.models.file_web import FileListQueryVO
+
+    from .cache import TTLCache
     from .coordinator import SupernoteStorageCoordinator
 
 
@@ -15,6 +21,10 @@ class SupernoteCloudData:
     """Runtime data stored in the ConfigEntry."""
 
     client: Supernote
+    extended: ExtendedClient
+    llm_semaphore: asyncio.Semaphore
+    folder_cache: TTLCache[int, FileListQueryVO]
+    note_pages_cache: TTLCache[tuple[int, str | None], PngVO]
     coordinator: SupernoteStorageCoordinator
 
 
@@ -121,6 +121,7 @@ def mock_supernote_fixture() -> Generator[AsyncMock]:
         )
         mock_sn.device.list_folder = AsyncMock()
         mock_sn.client.get_content = AsyncMock()
+        mock_sn.client.get = AsyncMock()
         mock_sn.client.request = AsyncMock()
 
         # Class methods
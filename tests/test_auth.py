@@ -0,0 +1,101 @@
+"""Tests for the Supernote Cloud config entry auth."""
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+from freezegun import freeze_time
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.supernote_cloud.auth import ConfigEntryAuth
+from custom_components.supernote_cloud.const import (
+    CONF_TOKEN_TIMESTAMP,
+    TOKEN_LIFETIME,
+)
+
+
+def _set_token_age(
+    hass: HomeAssistant, config_entry: MockConfigEntry, age_seconds: float
+) -> None:
+    """Update the config entry so the stored token has the specified age."""
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            **config_entry.options,
+            CONF_USERNAME: "user-name",
+            CONF_TOKEN_TIMESTAMP: dt_util.now().timestamp() - age_seconds,
+        },
+    )
+
+
+@freeze_time("2021-01-01 12:00:00")
+async def test_valid_token_not_refreshed(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test that a fresh token is returned without logging in again."""
+    _set_token_age(hass, config_entry, 60)
+    auth = ConfigEntryAuth(hass, config_entry, async_get_clientsession(hass))
+
+    with patch(
+        "supernote.client.login_client.LoginClient.login",
+        return_value="access-token-2",
+    ) as mock_login:
+        assert await auth.async_get_access_token() == "access-token-1"
+
+    assert not mock_login.mock_calls
+
+
+@freeze_time("2021-01-01 12:00:00")
+async def test_token_refreshed_before_expiry(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test that a token about to expire is refreshed proactively."""
+    _set_token_age(hass, config_entry, TOKEN_LIFETIME.total_seconds() - 30)
+    auth = ConfigEntryAuth(hass, config_entry, async_get_clientsession(hass))
+
+    with patch(
+        "supernote.client.login_client.LoginClient.login",
+        return_value="access-token-2",
+    ) as mock_login:
+        assert await auth.async_get_access_token() == "access-token-2"
+        assert await auth.async_get_access_token() == "access-token-2"
+
+    assert len(mock_login.mock_calls) == 1
+    assert config_entry.options[CONF_ACCESS_TOKEN] == "access-token-2"
+    assert config_entry.options[CONF_TOKEN_TIMESTAMP] == dt_util.now().timestamp()
+
+
+@freeze_time("2021-01-01 12:00:00")
+async def test_concurrent_refresh_coalesced(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test that concurrent callers share a single token refresh."""
+    _set_token_age(hass, config_entry, TOKEN_LIFETIME.total_seconds() + 1)
+    auth = ConfigEntryAuth(hass, config_entry, async_get_clientsession(hass))
+
+    login_finished = asyncio.Event()
+
+    async def _blocking_login(*args: Any) -> str:
+        await login_finished.wait()
+        return "access-token-2"
+
+    with patch(
+        "supernote.client.login_client.LoginClient.login",
+        side_effect=_blocking_login,
+    ) as mock_login:
+        tasks = [asyncio.create_task(auth.async_get_access_token()) for _ in range(5)]
+        # Let every caller run until it is waiting on the in-progress refresh
+        await asyncio.sleep(0)
+        assert not any(task.done() for task in tasks)
+        login_finished.set()
+        tokens = await asyncio.gather(*tasks)
+
+    assert tokens == ["access-token-2"] * 5
+    assert mock_login.await_count == 1
@@ -0,0 +1,62 @@
+"""Tests for the Supernote Cloud response caches."""
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+
+from custom_components.supernote_cloud.cache import TTLCache
+
+
+async def test_concurrent_fetches_coalesced() -> None:
+    """Test that concurrent lookups of the same key share one fetch."""
+    cache: TTLCache[int, str] = TTLCache(60)
+    fetch = AsyncMock(return_value="value")
+
+    results = await asyncio.gather(
+        *(cache.async_get_or_fetch(1, fetch) for _ in range(5))
+    )
+
+    assert results == ["value"] * 5
+    assert fetch.await_count == 1
+    assert await cache.async_get_or_fetch(1, fetch) == "value"
+    assert fetch.await_count == 1
+
+
+async def test_value_expires(freezer: FrozenDateTimeFactory) -> None:
+    """Test that a value is fetched again once it expires."""
+    cache: TTLCache[int, str] = TTLCache(60)
+    fetch = AsyncMock(side_effect=["value-1", "value-2"])
+
+    assert await cache.async_get_or_fetch(1, fetch) == "value-1"
+    freezer.tick(61)
+    assert await cache.async_get_or_fetch(1, fetch) == "value-2"
+
+
+async def test_errors_not_cached() -> None:
+    """Test that a failed fetch is retried on the next lookup."""
+    cache: TTLCache[int, str] = TTLCache(60)
+    fetch = AsyncMock(side_effect=[ValueError("failed"), "value"])
+
+    with pytest.raises(ValueError, match="failed"):
+        await cache.async_get_or_fetch(1, fetch)
+    assert await cache.async_get_or_fetch(1, fetch) == "value"
+
+
+async def test_fetch_uses_task_factory() -> None:
+    """Test that fetches run as tasks made by the owner's task factory."""
+    created: list[asyncio.Task[str]] = []
+
+    def create_task(target: Coroutine[Any, Any, str]) -> asyncio.Task[str]:
+        task = asyncio.ensure_future(target)
+        created.append(task)
+        return task
+
+    cache: TTLCache[int, str] = TTLCache(60, create_task=create_task)
+    fetch = AsyncMock(return_value="value")
+
+    assert await cache.async_get_or_fetch(1, fetch) == "value"
+    assert len(created) == 1
@@ -74,6 +74,7 @@ async def test_full_flow(
     assert config_entry.unique_id == "username"
 
     assert len(mock_setup.mock_calls) == 1
+    mock_supernote.device.get_capacity.assert_not_called()
 
 
 async def test_login_failed(
@@ -105,32 +106,6 @@ async def test_login_failed(
     assert result.get("errors") == {"base": "api_error"}
 
 
-async def test_user_query_failed(
-    hass: HomeAssistant,
-    mock_supernote: MagicMock,
-) -> None:
-    """Test selecting a device in the configuration flow."""
-    result = await hass.config_entries.flow.async_init(
-        DOMAIN, context={"source": config_entries.SOURCE_USER}
-    )
-    assert result.get("type") is FlowResultType.FORM
-    assert result.get("errors") is None
-
-    mock_supernote.device.get_capacity.side_effect = ApiException("Query failed")
-
-    result = await hass.config_entries.flow.async_configure(
-        result["flow_id"],
-        {
-            CONF_USERNAME: "username",
-            CONF_PASSWORD: "password",
-            CONF_HOST: "https://supernote.local",
-        },
-    )
-    await hass.async_block_till_done()
-    assert result.get("type") is FlowResultType.FORM
-    assert result.get("errors") == {"base": "api_error"}
-
-
 @freeze_time("2021-01-01 12:00:00")
 async def test_reauth_flow(
     hass: HomeAssistant,
@@ -3,10 +3,11 @@
 from unittest.mock import AsyncMock
 
 import pytest
+from freezegun import freeze_time
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import llm
 from pytest_homeassistant_custom_component.common import MockConfigEntry
-from supernote.client.exceptions import UnauthorizedException
+from supernote.client.exceptions import ApiException, UnauthorizedException
 from supernote.models.extended import (
     SearchResultVO,
     WebSearchResponseVO,
@@ -134,7 +135,7 @@ async def test_search_tool_call_error(
     mock_supernote: AsyncMock,
 ):
     """Test calling the search tool with an error."""
-    mock_supernote.client.post_json = AsyncMock(side_effect=Exception("API Error"))
+    mock_supernote.client.post_json = AsyncMock(side_effect=ApiException("API Error"))
 
     tool_input = llm.ToolInput(
         tool_name="search_supernote", tool_args={"query": "test query"}
@@ -152,7 +153,7 @@ async def test_transcript_tool_call_error(
     mock_supernote: AsyncMock,
 ):
     """Test calling the transcript tool with an error."""
-    mock_supernote.client.post_json = AsyncMock(side_effect=Exception("API Error"))
+    mock_supernote.client.post_json = AsyncMock(side_effect=ApiException("API Error"))
 
     tool_input = llm.ToolInput(
         tool_name="get_supernote_transcript", tool_args={"file_id": 12345}
@@ -215,3 +216,121 @@ async def test_transcript_tool_auth_error(
     assert len(flows) == 1
     assert flows[0]["handler"] == DOMAIN
     assert flows[0]["context"]["source"] == "reauth"
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_llm_api_unregistered_on_unload(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test the LLM API is removed when the config entry is unloaded."""
+    api_id = f"{DOMAIN}-{config_entry.entry_id}"
+    assert api_id in {api.id for api in llm.async_get_apis(hass)}
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert api_id not in {api.id for api in llm.async_get_apis(hass)}
+
+
+@pytest.mark.usefixtures("mock_supernote")
+async def test_search_tool_results_cached(
+    hass: HomeAssistant,
+    search_tool: SearchTool,
+    mock_supernote: AsyncMock,
+):
+    """Test repeated identical searches are served from the cache."""
+    mock_supernote.client.post_json = AsyncMock(
+        return_value=WebSearchResponseVO(results=[])
+    )
+
+    tool_input = llm.ToolInput(
+        tool_name="search_supernote",
+        tool_args={"query": "test query", "date_before": "2024-03-10"},
+    )
+
+    assert await search_tool.async_call(hass, tool_input, AsyncMock()) == {
+        "results": []
+    }
+    assert await search_tool.async_call(hass, tool_input, AsyncMock()) == {
+        "results": []
+    }
+    mock_supernote.client.post_json.assert_called_once()
+
+    # A different query is fetched again
+    tool_input = llm.ToolInput(
+        tool_name="search_supernote",
+        tool_args={"query": "other query", "date_before": "2024-03-10"},
+    )
+    await search_tool.async_call(hass, tool_input, AsyncMock())
+    assert len(mock_supernote.client.post_json.mock_calls) == 2
+
+
+@freeze_time("2024-03-15 12:00:00")
+@pytest.mark.usefixtures("mock_supernote")
+async def test_search_tool_date_range_including_today_not_cached(
+    hass: HomeAssistant,
+    search_tool: SearchTool,
+    mock_supernote: AsyncMock,
+):
+    """Test searches that may match notes written today are not cached."""
+    mock_supernote.client.post_json = AsyncMock(
+        return_value=WebSearchResponseVO(results=[])
+    )
+
+    tool_input = llm.ToolInput(
+        tool_name="search_supernote",
+        tool_args={"query": "test query", "date_after": "2024-03-01"},
+    )
+    await search_tool.async_call(hass, tool_input, AsyncMock())
+    await search_tool.async_call(hass, tool_input, AsyncMock())
+    assert len(mock_supernote.client.post_json.mock_calls) == 2
+
+    # An unfiltered search is open ended and includes today
+    tool_input = llm.ToolInput(
+        tool_name="search_supernote", tool_args={"query": "test query"}
+    )
+    await search_tool.async_call(hass, tool_input, AsyncMock())
+    await search_tool.async_call(hass, tool_input, AsyncMock())
+    assert len(mock_supernote.client.post_json.mock_calls) == 4
+
+    # A range that ended before today is cached
+    tool_input = llm.ToolInput(
+        tool_name="search_supernote",
+        tool_args={
+            "query": "test query",
+            "date_after": "2024-03-01",
+            "date_before": "2024-03-10",
+        },
+    )
+    await search_tool.async_call(hass, tool_input, AsyncMock())
+    await search_tool.async_call(hass, tool_input, AsyncMock())
+    assert len(mock_supernote.client.post_json.mock_calls) == 5
+
+
+@pytest.mark.usefixtures("mock_supernote")
+async def test_transcript_tool_results_cached(
+    hass: HomeAssistant,
+    transcript_tool: TranscriptTool,
+    mock_supernote: AsyncMock,
+):
+    """Test repeated identical transcript requests are served from the cache."""
+    mock_supernote.client.post_json = AsyncMock(
+        return_value=WebTranscriptResponseVO(transcript="Transcript.")
+    )
+
+    tool_input = llm.ToolInput(
+        tool_name="get_supernote_transcript", tool_args={"file_id": 12345}
+    )
+    expected = {"transcript": "Transcript."}
+    assert await transcript_tool.async_call(hass, tool_input, AsyncMock()) == expected
+    assert await transcript_tool.async_call(hass, tool_input, AsyncMock()) == expected
+    mock_supernote.client.post_json.assert_called_once()
+
+    # A different page range is fetched again
+    tool_input = llm.ToolInput(
+        tool_name="get_supernote_transcript",
+        tool_args={"file_id": 12345, "start_index": 0, "end_index": 1},
+    )
+    await transcript_tool.async_call(hass, tool_input, AsyncMock())
+    assert len(mock_supernote.client.post_json.mock_calls) == 2
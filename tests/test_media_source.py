@@ -1,9 +1,11 @@
 """Test the Supernote Cloud media source."""
 
+from collections.abc import AsyncIterator
 from http import HTTPStatus
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import MagicMock
 
 import pytest
+from aiohttp import ClientPayloadError
 from homeassistant.components.media_player.errors import BrowseError
 from homeassistant.components.media_source import (
     URI_SCHEME,
@@ -17,7 +19,8 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
 from supernote.client.exceptions import ApiException
 from supernote.models.base import BooleanEnum
-from supernote.models.file_web import FilePathQueryVO, PngPageVO, PngVO, UserFileVO
+from supernote.models.file_device import PngPageVO, PngVO
+from supernote.models.file_web import FilePathQueryVO, UserFileVO
 
 from custom_components.supernote_cloud.const import DOMAIN
 
@@ -26,6 +29,52 @@ from .conftest import CONFIG_ENTRY_ID, CONFIG_ENTRY_TITLE
 SOURCE_TITLE = "Supernote Cloud"
 ROOT_FOLDER_PATH = f"{CONFIG_ENTRY_ID}/f/0"
 CONTENT_BYTES = b"some-content"
+NOTE_FILE = UserFileVO(
+    id="33333333333",
+    directory_id="1111111111111111",
+    file_name="Note title.note",
+    is_folder=BooleanEnum.NO,
+    md5="abcdef",
+)
+NOTE_PAGES = PngVO(
+    png_page_vo_list=[
+        PngPageVO(page_no=1, url="http://example.com/1.png"),
+        PngPageVO(page_no=2, url="http://example.com/2.png"),
+    ]
+)
+NOTE_PAGE_URL_PREFIX = f"/api/supernote_cloud/item_content/{CONFIG_ENTRY_ID}:p:1111111111111111:33333333333"
+
+
+def _mock_page_response(
+    content: bytes,
+    headers: dict[str, str] | None = None,
+    error: Exception | None = None,
+) -> MagicMock:
+    """Return a mock upstream response that streams a page image.
+
+    When an error is given, half of the content is streamed before it is raised.
+    """
+
+    async def iter_chunked(_: int) -> AsyncIterator[bytes]:
+        if error is None:
+            yield content
+            return
+        yield content[: len(content) // 2]
+        raise error
+
+    response = MagicMock()
+    response.content_length = len(content)
+    response.headers = headers or {}
+    response.content.iter_chunked = iter_chunked
+    return response
+
+
+@pytest.fixture(name="note_file")
+def mock_note_file(mock_supernote: MagicMock) -> None:
+    """Fixture for a folder containing a single two page note."""
+    mock_supernote.web.list_query.return_value.user_file_vo_list = [NOTE_FILE]
+    mock_supernote.device.note_to_png.return_value = NOTE_PAGES
+    mock_supernote.client.get.return_value = _mock_page_response(CONTENT_BYTES)
 
 
 @pytest.fixture(autouse=True)
@@ -164,13 +213,6 @@ async def test_browse_folders(
         ]
     )
 
-    # Mock list_folder for resolution
-    mock_file_info = MagicMock()
-    mock_file_info.id = "33333333333"
-    mock_folder = MagicMock()
-    mock_folder.entries = [mock_file_info]
-    mock_supernote.device.list_folder = AsyncMock(return_value=mock_folder)
-
     browse = await async_browse_media(hass, f"{URI_SCHEME}{DOMAIN}/{note_path}")
     assert browse.domain == DOMAIN
     assert browse.identifier == note_path
@@ -191,7 +233,7 @@ async def test_browse_folders(
     assert not browse.children
 
     # Resolve media
-    mock_supernote.client.get_content.return_value = b"page2_content"
+    mock_supernote.client.get.return_value = _mock_page_response(b"page2_content")
 
     media = await async_resolve_media(
         hass, f"{URI_SCHEME}{DOMAIN}/{page_path_prefix}/1", None
@@ -203,6 +245,9 @@ async def test_browse_folders(
     contents = await response.read()
     assert contents == b"page2_content"
 
+    # The note was converted once while browsing and reused for the page
+    assert mock_supernote.device.note_to_png.call_count == 1
+
 
 @pytest.mark.usefixtures("setup_integration")
 async def test_browse_folder_as_file(
@@ -234,10 +279,9 @@ async def test_browse_folder_as_file(
         await async_browse_media(hass, f"{URI_SCHEME}{DOMAIN}/{invalid_note_path}")
 
 
-@pytest.mark.usefixtures("setup_integration")
+@pytest.mark.usefixtures("setup_integration", "note_file")
 async def test_item_content_invalid_identifier(
     hass: HomeAssistant,
-    mock_supernote: MagicMock,
     hass_client: ClientSessionGenerator,
 ) -> None:
     """Test fetching content for invalid ids."""
@@ -258,25 +302,83 @@ async def test_item_content_invalid_identifier(
     )
     assert response.status == HTTPStatus.BAD_REQUEST
 
-    mock_file_info = MagicMock()
-    mock_file_info.id = "33333333333"
+    client = await hass_client()
+    response = await client.get(f"{NOTE_PAGE_URL_PREFIX}:99")
+    assert response.status == HTTPStatus.NOT_FOUND
 
-    mock_folder = MagicMock()
-    mock_folder.entries = [mock_file_info]
 
-    mock_supernote.device.list_folder = AsyncMock(return_value=mock_folder)
-    mock_supernote.device.note_to_png.return_value = PngVO(
-        png_page_vo_list=[PngPageVO(page_no=1, url="http://example.com/1.png")]
-    )
-    mock_supernote.client.get_content.return_value = b"page1"
+@pytest.mark.usefixtures("setup_integration", "note_file")
+async def test_item_content_reuses_folder_listing(
+    hass: HomeAssistant,
+    mock_supernote: MagicMock,
+    hass_client: ClientSessionGenerator,
+) -> None:
+    """Test that serving several pages of a note lists and converts it once."""
+    client = await hass_client()
+    for page_id in range(2):
+        response = await client.get(f"{NOTE_PAGE_URL_PREFIX}:{page_id}")
+        assert response.status == HTTPStatus.OK
+        assert response.headers["Content-Length"] == str(len(CONTENT_BYTES))
+        assert await response.read() == CONTENT_BYTES
+
+    assert mock_supernote.web.list_query.call_count == 1
+    assert mock_supernote.device.note_to_png.call_count == 1
+
+
+@pytest.mark.usefixtures("setup_integration", "note_file")
+async def test_item_content_not_modified(
+    hass: HomeAssistant,
+    mock_supernote: MagicMock,
+    hass_client: ClientSessionGenerator,
+) -> None:
+    """Test that a page the client already has is not downloaded again."""
+    url = f"{NOTE_PAGE_URL_PREFIX}:0"
 
     client = await hass_client()
+    response = await client.get(url)
+    assert response.status == HTTPStatus.OK
+    assert await response.read() == CONTENT_BYTES
+    etag = response.headers["ETag"]
+    assert etag == '"abcdef-0"'
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status == HTTPStatus.NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert mock_supernote.client.get.call_count == 1
+
+    # A page the note does not have is never reported as unchanged
     response = await client.get(
-        f"/api/supernote_cloud/item_content/{CONFIG_ENTRY_ID}:p:1111111111111111:33333333333:99"
+        f"{NOTE_PAGE_URL_PREFIX}:99", headers={"If-None-Match": '"abcdef-99"'}
     )
     assert response.status == HTTPStatus.NOT_FOUND
 
 
+@pytest.mark.parametrize(
+    "upstream_headers",
+    [{}, {"Content-Encoding": "gzip"}],
+    ids=["content-length", "chunked"],
+)
+@pytest.mark.usefixtures("setup_integration", "note_file")
+async def test_item_content_upstream_error_mid_stream(
+    hass: HomeAssistant,
+    mock_supernote: MagicMock,
+    hass_client: ClientSessionGenerator,
+    upstream_headers: dict[str, str],
+) -> None:
+    """Test a failed upstream read aborts the page rather than truncating it."""
+    mock_supernote.client.get.return_value = _mock_page_response(
+        CONTENT_BYTES,
+        headers=upstream_headers,
+        error=ClientPayloadError("Connection lost"),
+    )
+
+    client = await hass_client()
+    response = await client.get(f"{NOTE_PAGE_URL_PREFIX}:0")
+    with pytest.raises(ClientPayloadError):
+        await response.read()
+
+
 @pytest.mark.usefixtures("setup_integration")
 async def test_authentication_error(
     hass: HomeAssistant,